@@ -2,6 +2,7 @@
 File routes for the PandaAGI SDK API.
 """
 
+import asyncio
 import logging
 import mimetypes
 import os
@@ -139,6 +140,68 @@ async def validate_and_correct_file_path(
         return None
 
 
+def _render_markdown_to_pdf(md_content: str, title: str) -> bytes:
+    """
+    Convert markdown content to a styled PDF document.
+
+    Rendering is CPU-bound, so callers run it in a worker thread to keep the
+    event loop free.
+
+    Args:
+        md_content: The markdown source
+        title: Title for the generated HTML document
+
+    Returns:
+        bytes: The rendered PDF
+    """
+    import markdown
+    import weasyprint
+
+    # Convert markdown to HTML
+    html = markdown.markdown(md_content, extensions=["tables", "fenced_code", "toc"])
+
+    logger.debug("Successfully converted markdown to HTML")
+
+    # Add basic CSS styling for better PDF appearance
+    html_with_style = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <title>{title}</title>
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; margin: 40px; color: #333; }}
+            h1, h2, h3, h4, h5, h6 {{ color: #2c3e50; margin-top: 24px; margin-bottom: 16px; }}
+            h1 {{ border-bottom: 2px solid #eaecef; padding-bottom: 8px; }}
+            h2 {{ border-bottom: 1px solid #eaecef; padding-bottom: 4px; }}
+            code {{ background-color: #f6f8fa; padding: 2px 4px; border-radius: 3px; font-family: 'SFMono-Regular', Consolas, monospace; }}
+            pre {{ background-color: #f6f8fa; padding: 16px; border-radius: 6px; overflow-x: auto; }}
+            blockquote {{ border-left: 4px solid #dfe2e5; padding-left: 16px; margin-left: 0; color: #6a737d; }}
+            table {{ border-collapse: collapse; width: 100%; margin: 16px 0; }}
+            th, td {{ border: 1px solid #dfe2e5; padding: 8px 12px; text-align: left; }}
+            th {{ background-color: #f6f8fa; font-weight: 600; }}
+            a {{ color: #0366d6; text-decoration: none; }}
+            a:hover {{ text-decoration: underline; }}
+        </style>
+    </head>
+    <body>
+        {html}
+    </body>
+    </html>
+    """
+
+    logger.debug("Created HTML with styling")
+
+    # Create HTML document from string and convert to PDF bytes
+    try:
+        return weasyprint.HTML(string=html_with_style).write_pdf()
+    except Exception as pdf_error:
+        logger.debug(
+            f"PDF conversion error details: {type(pdf_error).__name__}: {pdf_error}"
+        )
+        raise pdf_error
+
+
 @router.get("/{conversation_id}/files/download")
 async def download_file(
     conversation_id: str,
@@ -213,13 +276,6 @@ async def download_file(
         if resolved_path.suffix.lower() in [".md", ".markdown"]:
             logger.debug(f"Attempting to convert markdown file: {resolved_path}")
             try:
-                from io import BytesIO
-
-                import markdown
-                import weasyprint
-
-                logger.debug("Successfully imported markdown and weasyprint")
-
                 # Read markdown content using E2BEnv
                 file_result = await local_env.read_file(
                     resolved_path, mode="r", encoding="utf-8"
@@ -232,66 +288,18 @@ async def download_file(
                 md_content = file_result["content"]
                 logger.debug(f"Read markdown content, length: {len(md_content)}")
 
-                # Convert markdown to HTML
-                html = markdown.markdown(
-                    md_content, extensions=["tables", "fenced_code", "toc"]
+                # Render off the event loop so other requests keep being served
+                pdf_bytes = await asyncio.to_thread(
+                    _render_markdown_to_pdf, md_content, resolved_path.stem
                 )
 
-                logger.debug("Successfully converted markdown to HTML")
-
-                # Add basic CSS styling for better PDF appearance
-                html_with_style = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="utf-8">
-                    <title>{resolved_path.stem}</title>
-                    <style>
-                        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; margin: 40px; color: #333; }}
-                        h1, h2, h3, h4, h5, h6 {{ color: #2c3e50; margin-top: 24px; margin-bottom: 16px; }}
-                        h1 {{ border-bottom: 2px solid #eaecef; padding-bottom: 8px; }}
-                        h2 {{ border-bottom: 1px solid #eaecef; padding-bottom: 4px; }}
-                        code {{ background-color: #f6f8fa; padding: 2px 4px; border-radius: 3px; font-family: 'SFMono-Regular', Consolas, monospace; }}
-                        pre {{ background-color: #f6f8fa; padding: 16px; border-radius: 6px; overflow-x: auto; }}
-                        blockquote {{ border-left: 4px solid #dfe2e5; padding-left: 16px; margin-left: 0; color: #6a737d; }}
-                        table {{ border-collapse: collapse; width: 100%; margin: 16px 0; }}
-                        th, td {{ border: 1px solid #dfe2e5; padding: 8px 12px; text-align: left; }}
-                        th {{ background-color: #f6f8fa; font-weight: 600; }}
-                        a {{ color: #0366d6; text-decoration: none; }}
-                        a:hover {{ text-decoration: underline; }}
-                    </style>
-                </head>
-                <body>
-                    {html}
-                </body>
-                </html>
-                """
-
-                logger.debug("Created HTML with styling")
-
-                # Convert HTML to PDF
-                try:
-                    # Create HTML document from string and convert to PDF bytes
-                    html_doc = weasyprint.HTML(string=html_with_style)
-                    pdf_bytes = html_doc.write_pdf()
-
-                    # Write to buffer
-                    pdf_buffer = BytesIO()
-                    pdf_buffer.write(pdf_bytes)
-                    pdf_buffer.seek(0)
-                except Exception as pdf_error:
-                    logger.debug(
-                        f"PDF conversion error details: {type(pdf_error).__name__}: {pdf_error}"
-                    )
-                    raise pdf_error
-
                 logger.debug("Successfully converted HTML to PDF")
 
                 # Create a temporary PDF file
                 with tempfile.NamedTemporaryFile(
                     delete=False, suffix=".pdf"
                 ) as temp_pdf:
-                    temp_pdf.write(pdf_buffer.getvalue())
+                    temp_pdf.write(pdf_bytes)
                     temp_pdf_path = temp_pdf.name
 
                 logger.debug(f"Created temporary PDF file: {temp_pdf_path}")
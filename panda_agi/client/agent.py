@@ -26,6 +26,7 @@ from .models import (
     BaseStreamEvent,
     Message,
     Skill,
+    ToolInfo,
     ToolsConfig,
 )
 from .panda_agi_client import PandaAgiClient, PandaAgiConnectionError
@@ -90,6 +91,8 @@ class Agent:
         )
         # Initialize tools list
         self.tools = []
+        # Tool descriptions sent with every request, rebuilt when tools change
+        self._tool_infos: Optional[List[ToolInfo]] = None
 
         self.state = AgentState()
         self.state.tools_config = ToolsConfig(
@@ -275,6 +278,9 @@ class Agent:
                 f"Tools length is greater than {MAX_TOOLS_LENGTH}. Reduce the number of tools."
             )
 
+        # Invalidate the cached tool descriptions
+        self._tool_infos = None
+
         # Check if it's a skill or custom tool
         if hasattr(tool_function, "_skill"):
             self.tools.append(self._process_single_skill(tool_function))
@@ -286,6 +292,15 @@ class Agent:
                 "Please ensure all functions are properly decorated."
             )
 
+    def _get_tool_infos(self) -> Optional[List[ToolInfo]]:
+        """Get the tool descriptions sent to the backend, built once per tool set"""
+        if not self.tools:
+            return None
+
+        if self._tool_infos is None:
+            self._tool_infos = [tool.to_tool_info() for tool in self.tools]
+        return self._tool_infos
+
     async def run_stream(
         self,
         query: str,
@@ -313,7 +328,7 @@ class Agent:
             messages=[input_message],
             model=self.model,
             tools_config=self.state.tools_config,
-            tools=[tool.to_tool_info() for tool in self.tools] if self.tools else None,
+            tools=self._get_tool_infos(),
         )
 
         # Initialize storage for immediate tool execution results
@@ -971,9 +986,7 @@ class Agent:
                 messages=[Message(role="user", content="Continue processing.")],
                 model=self.model,
                 tools_config=self.state.tools_config,
-                tools=(
-                    [tool.to_tool_info() for tool in self.tools] if self.tools else None
-                ),
+                tools=self._get_tool_infos(),
             )
 
         # Format tool results as a message
@@ -1007,7 +1020,7 @@ class Agent:
             messages=[tool_message],
             model=self.model,
             tools_config=self.state.tools_config,
-            tools=[tool.to_tool_info() for tool in self.tools] if self.tools else None,
+            tools=self._get_tool_infos(),
         )
 
         logger.debug(
@@ -2,9 +2,10 @@ import inspect
 import json
 import logging
 import os
+import re
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, List, Literal, Optional, Type, Union
 
 import requests
 from pydantic import BaseModel, Field
@@ -14,6 +15,16 @@ from panda_agi.train import TrainingModel
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Patterns scanned on every streamed token by AgentResponse
+_COST_PATTERN = re.compile(
+    r'\{"cost":\s*([0-9.]+),\s*"input_tokens":\s*(\d+),\s*"output_tokens":\s*(\d+)\}'
+)
+_USER_MESSAGE_PATTERN = re.compile(
+    r"<user_send_message>(.*?)</user_send_message>", re.DOTALL
+)
+_TOOL_CALL_PATTERN = re.compile(r"<(\w+)([^>]*)></\1>")
+_TOOL_ATTRIBUTE_PATTERN = re.compile(r'(\w+)="([^"]*?)"')
+
 
 class MessageType(Enum):
     """Types of messages in the system"""
@@ -365,39 +376,39 @@ class ImageGenerationEvent(BaseStreamEvent):
 class EventFactory:
     """Factory class for creating stream events based on EventType and data"""
 
+    _event_mapping: Dict[EventType, Type[BaseStreamEvent]] = {
+        EventType.AGENT_CONNECTION_SUCCESS: AgentConnectionSuccessEvent,
+        EventType.ERROR: ErrorEvent,
+        EventType.WEB_SEARCH: WebSearchEvent,
+        EventType.WEB_SEARCH_RESULT: WebSearchResultEvent,
+        EventType.WEB_NAVIGATION: WebNavigationEvent,
+        EventType.WEB_NAVIGATION_RESULT: WebNavigationResultEvent,
+        EventType.FILE_READ: FileReadEvent,
+        EventType.FILE_WRITE: FileWriteEvent,
+        EventType.FILE_REPLACE: FileReplaceEvent,
+        EventType.FILE_FIND: FileFindEvent,
+        EventType.FILE_EXPLORE: FileExploreEvent,
+        EventType.SHELL_EXEC: ShellExecEvent,
+        EventType.SHELL_VIEW: ShellViewEvent,
+        EventType.SHELL_WRITE: ShellWriteEvent,
+        EventType.USER_NOTIFICATION: UserNotificationEvent,
+        EventType.USER_QUESTION: UserQuestionEvent,
+        EventType.COMPLETED_TASK: CompletedTaskEvent,
+        EventType.USE_SKILL: UseSkillEvent,
+        EventType.USE_SKILL_RESULT: UseSkillResultEvent,
+        EventType.IMAGE_GENERATION: ImageGenerationEvent,
+    }
+
     @staticmethod
     def create(event_type: EventType, data: Dict[str, Any]) -> BaseStreamEvent:
         """Create an event instance based on EventType and data dictionary"""
 
         logger.info(f"Creating event: {event_type} with data: {data}")
 
-        event_mapping = {
-            EventType.AGENT_CONNECTION_SUCCESS: AgentConnectionSuccessEvent,
-            EventType.ERROR: ErrorEvent,
-            EventType.WEB_SEARCH: WebSearchEvent,
-            EventType.WEB_SEARCH_RESULT: WebSearchResultEvent,
-            EventType.WEB_NAVIGATION: WebNavigationEvent,
-            EventType.WEB_NAVIGATION_RESULT: WebNavigationResultEvent,
-            EventType.FILE_READ: FileReadEvent,
-            EventType.FILE_WRITE: FileWriteEvent,
-            EventType.FILE_REPLACE: FileReplaceEvent,
-            EventType.FILE_FIND: FileFindEvent,
-            EventType.FILE_EXPLORE: FileExploreEvent,
-            EventType.SHELL_EXEC: ShellExecEvent,
-            EventType.SHELL_VIEW: ShellViewEvent,
-            EventType.SHELL_WRITE: ShellWriteEvent,
-            EventType.USER_NOTIFICATION: UserNotificationEvent,
-            EventType.USER_QUESTION: UserQuestionEvent,
-            EventType.COMPLETED_TASK: CompletedTaskEvent,
-            EventType.USE_SKILL: UseSkillEvent,
-            EventType.USE_SKILL_RESULT: UseSkillResultEvent,
-            EventType.IMAGE_GENERATION: ImageGenerationEvent,
-        }
-
-        if event_type not in event_mapping:
+        event_class = EventFactory._event_mapping.get(event_type)
+        if event_class is None:
             raise ValueError(f"Unknown event type: {event_type}")
 
-        event_class = event_mapping[event_type]
         return event_class(**data)
 
     def __call__(self, event_type: EventType, data: Dict[str, Any]) -> BaseStreamEvent:
@@ -673,14 +684,14 @@ class AgentResponse:
 
     def _process_token_event(self, event):
         """Process token events to extract cost data and user messages"""
-        import re
-
         raw_token = event.get("raw_token", "")
         content = event.get("content", "")
 
+        # Most tokens are plain text, so only run each regex when its literal
+        # marker is present in the token
+
         # Check for cost data in the raw token (format: '...{"cost": 0.009702, "input_tokens": 4803, "output_tokens": 12}')
-        cost_pattern = r'\{"cost":\s*([0-9.]+),\s*"input_tokens":\s*(\d+),\s*"output_tokens":\s*(\d+)\}'
-        cost_match = re.search(cost_pattern, raw_token)
+        cost_match = '"cost"' in raw_token and _COST_PATTERN.search(raw_token)
         if cost_match:
             try:
                 cost_data = {
@@ -693,8 +704,10 @@ class AgentResponse:
                 pass
 
         # Check for user_send_message content to add to chat history
-        user_msg_pattern = r"<user_send_message>(.*?)</user_send_message>"
-        user_msg_match = re.search(user_msg_pattern, content, re.DOTALL)
+        user_msg_match = (
+            "</user_send_message>" in content
+            and _USER_MESSAGE_PATTERN.search(content)
+        )
         if user_msg_match:
             message_text = user_msg_match.group(1).strip()
             if message_text:  # Only add non-empty messages
@@ -708,8 +721,9 @@ class AgentResponse:
                 )
 
         # Check for tool calls in the content (e.g., <write_joke topic="Python"></write_joke>)
-        tool_call_pattern = r"<(\w+)([^>]*)></\1>"
-        tool_call_matches = re.finditer(tool_call_pattern, content)
+        tool_call_matches = (
+            _TOOL_CALL_PATTERN.finditer(content) if "></" in content else ()
+        )
         for match in tool_call_matches:
             tool_name = match.group(1)
             attributes_str = match.group(2)
@@ -720,8 +734,7 @@ class AgentResponse:
 
             # Parse attributes
             arguments = {}
-            attr_pattern = r'(\w+)="([^"]*?)"'
-            for attr_match in re.finditer(attr_pattern, attributes_str):
+            for attr_match in _TOOL_ATTRIBUTE_PATTERN.finditer(attributes_str):
                 attr_name = attr_match.group(1)
                 attr_value = attr_match.group(2)
                 arguments[attr_name] = attr_value
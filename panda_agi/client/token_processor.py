@@ -1,11 +1,23 @@
 import json
 import logging
 import re
+from functools import lru_cache
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 logger = logging.getLogger("TokenProcessor")
 logger.setLevel(logging.INFO)
 
+# Patterns used for every parsed tool call, compiled once at import
+_OPENING_TAG_PATTERN = re.compile(r"<([^>\s]+)[^>]*>")  # Group 1: tag name
+_ATTRIBUTE_PATTERN = re.compile(r'(\w+)=(["\'])(.*?)\2')
+
+
+@lru_cache(maxsize=128)
+def _tag_content_pattern(tag_name: str) -> re.Pattern:
+    """Compiled content pattern for a tag, built once per tag name"""
+    escaped_tag = re.escape(tag_name)
+    return re.compile(f"<{escaped_tag}[^>]*>(.*?)</{escaped_tag}>", re.DOTALL)
+
 
 class TokenProcessor:
     """Simple processor to collect and handle streaming tokens with XML tool detection"""
@@ -99,6 +111,11 @@ class TokenProcessor:
         if not self.tool_registry:
             return
 
+        # A tool call can only complete on a token that closes a tag, so skip
+        # rescanning the buffer for plain text tokens
+        if ">" not in new_content:
+            return
+
         # Look for complete XML tool calls
         xml_chunks = self._extract_xml_chunks(self.xml_buffer)
 
@@ -150,26 +167,22 @@ class TokenProcessor:
         if not self.tool_registry:
             return []
 
-        chunks = []
-
-        # Get XML patterns from registry
-        xml_patterns = self.tool_registry.get_all_xml_patterns()
-
-        for pattern in xml_patterns:
-            matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
-            chunks.extend(matches)
+        # Single pass over the content with the registry's combined pattern
+        xml_pattern = self.tool_registry.get_xml_detection_pattern()
+        if xml_pattern is None:
+            return []
 
-        return chunks
+        return [match.group(0) for match in xml_pattern.finditer(content)]
 
     def _parse_xml_tool_call(self, xml_chunk: str) -> Optional[Dict[str, Any]]:
         """Parse an XML chunk into a tool call using registry definitions"""
         try:
-            # Extract the tag name
-            tag_match = re.match(r"<([^>\s]+)", xml_chunk)
-            if not tag_match:
+            # Match the opening tag once for both the tag name and attributes
+            opening_tag_match = _OPENING_TAG_PATTERN.match(xml_chunk)
+            if not opening_tag_match:
                 return None
 
-            xml_tag = tag_match.group(1)
+            xml_tag = opening_tag_match.group(1)
 
             # Get tool definition from registry
             tool_def = self.tool_registry.get_xml_tool_definition(xml_tag)
@@ -182,7 +195,7 @@ class TokenProcessor:
             tool_call_id = f"tool_call_{self.tool_call_id_counter}"
 
             # Extract attributes and content
-            attributes = self._extract_attributes(xml_chunk)
+            attributes = self._extract_attributes(opening_tag_match.group(0))
             content = self._extract_tag_content(xml_chunk, xml_tag)
 
             # Build arguments using tool definition
@@ -241,20 +254,12 @@ class TokenProcessor:
             if "exec_dir" not in arguments:
                 arguments["exec_dir"] = "."
 
-    def _extract_attributes(self, xml_chunk: str) -> Dict[str, str]:
-        """Extract attributes from XML opening tag"""
+    def _extract_attributes(self, opening_tag: str) -> Dict[str, str]:
+        """Extract attributes from an already matched XML opening tag"""
         attributes = {}
 
-        # Find the opening tag
-        opening_tag_match = re.match(r"<[^>]*>", xml_chunk)
-        if not opening_tag_match:
-            return attributes
-
-        opening_tag = opening_tag_match.group(0)
-
         # Extract attributes using regex
-        attr_pattern = r'(\w+)=(["\'])(.*?)\2'
-        matches = re.findall(attr_pattern, opening_tag)
+        matches = _ATTRIBUTE_PATTERN.findall(opening_tag)
 
         for attr_name, quote, attr_value in matches:
             attributes[attr_name] = attr_value
@@ -264,9 +269,7 @@ class TokenProcessor:
     def _extract_tag_content(self, xml_chunk: str, tag_name: str) -> Optional[str]:
         """Extract content between opening and closing tags"""
         try:
-            # Simple pattern to extract content
-            pattern = f"<{tag_name}[^>]*>(.*?)</{tag_name}>"
-            match = re.search(pattern, xml_chunk, re.DOTALL)
+            match = _tag_content_pattern(tag_name).search(xml_chunk)
 
             if match:
                 return match.group(1).strip()
@@ -282,8 +285,9 @@ class TokenProcessor:
         if not self.tool_registry:
             return None
 
-        function_mapping = self.tool_registry.get_xml_function_mapping()
-        return function_mapping.get(xml_tag)
+        # Look up the single definition instead of rebuilding the full mapping
+        tool_def = self.tool_registry.get_xml_tool_definition(xml_tag)
+        return tool_def.function_name if tool_def else None
 
     def _extract_content(self, data: Dict) -> str:
         """Extract content from structured token data"""
@@ -1,6 +1,29 @@
+import importlib
+from typing import TYPE_CHECKING
+
 from .base_env import BaseEnv
-from .docker_env import DockerEnv
-from .e2b_env import E2BEnv
 from .local_env import LocalEnv
 
+if TYPE_CHECKING:
+    from .docker_env import DockerEnv
+    from .e2b_env import E2BEnv
+
+# Environments loaded on first access, so importing panda_agi does not pull in
+# the E2B SDK (or the Docker wrapper) unless they are actually used.
+_LAZY_ENVS = {
+    "DockerEnv": "docker_env",
+    "E2BEnv": "e2b_env",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ENVS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    env_class = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = env_class
+    return env_class
+
+
 __all__ = ["BaseEnv", "LocalEnv", "DockerEnv", "E2BEnv"]
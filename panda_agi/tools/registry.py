@@ -1,4 +1,5 @@
 import logging
+import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Type
 
@@ -30,6 +31,7 @@ class ToolRegistry:
     _handlers: Dict[str, Type[ToolHandler]] = {}
     _aliases: Dict[str, str] = {}
     _xml_tools: Dict[str, XMLToolDefinition] = {}  # xml_tag -> definition
+    _xml_detection_pattern: Optional[re.Pattern] = None  # Rebuilt on registration
 
     @classmethod
     def register(
@@ -97,6 +99,7 @@ class ToolRegistry:
             is_breaking=is_breaking,
         )
         cls._xml_tools[xml_tag] = definition
+        cls._xml_detection_pattern = None
         logger.debug(f"Registered XML tool: {xml_tag} -> {function_name}")
 
     @classmethod
@@ -114,6 +117,27 @@ class ToolRegistry:
             patterns.append(pattern)
         return patterns
 
+    @classmethod
+    def get_xml_detection_pattern(cls) -> Optional[re.Pattern]:
+        """
+        Get a single compiled regex matching a complete call to any XML tool.
+
+        Equivalent to the patterns from get_all_xml_patterns() joined into one
+        alternation, so the stream buffer is scanned once per token instead of
+        once per registered tool. Group 1 holds the matched tag name.
+
+        Returns:
+            The compiled pattern, or None if no XML tools are registered
+        """
+        if cls._xml_detection_pattern is None and cls._xml_tools:
+            # Longest tags first to avoid backtracking on tags sharing a prefix
+            tags = sorted(cls._xml_tools, key=len, reverse=True)
+            alternation = "|".join(re.escape(tag) for tag in tags)
+            cls._xml_detection_pattern = re.compile(
+                f"<({alternation})[^>]*>.*?</\\1>", re.DOTALL | re.IGNORECASE
+            )
+        return cls._xml_detection_pattern
+
     @classmethod
     def get_xml_function_mapping(cls) -> Dict[str, str]:
         """Get mapping from XML tag to function name"""